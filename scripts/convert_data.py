@@ -5,25 +5,279 @@ This script processes XML elevation data and creates a binary grid file for fast
 """
 
 import struct
-import xml.etree.ElementTree as ET
 import numpy as np
 from pathlib import Path
 import argparse
 import logging
-from typing import Tuple, Optional
+import math
+import mmap
+import multiprocessing
+import os
+from typing import Callable, List, Tuple, Optional, Union
 import glob
+import io
 import re
+import warnings
+from xml.parsers import expat
+
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        """Run JIT-decorated helpers as plain Python when numba is not installed."""
+        def decorator(func):
+            return func
+        return decorator
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# width, height, min_lat, max_lat, min_lon, max_lon, grid_size (see elevation.GridHeader)
+HEADER_FORMAT = '<ii5d'
+
+GML_TUPLE_LIST = '{http://www.opengis.net/gml/3.2}tupleList'
+GML_LOWER_CORNER = '{http://www.opengis.net/gml/3.2}lowerCorner'
+GML_UPPER_CORNER = '{http://www.opengis.net/gml/3.2}upperCorner'
+
+# (min_lat, max_lat, min_lon, max_lon)
+Bounds = Tuple[float, float, float, float]
+
+# Edge length in cells of the tiles generate_test_data fills at a time
+TEST_DATA_TILE = 1024
+
+# Rows gathered per block when interpolate_missing writes back into the grid
+INTERPOLATE_BLOCK_ROWS = 64
+
+# Bilinear weights at or below this are floating-point noise from samples that
+# sit on a cell centre, and must not make a neighbouring cell count as covered
+SPLAT_MIN_WEIGHT = 1e-6
+
+# Rows fed to the zstd compressor per write in save_compressed
+COMPRESS_BLOCK_ROWS = 256
+
+# (min_lat, max_lat, min_lon, max_lon, elevation_cm) overrides for generate_test_data
+TEST_REGIONS = [
+    (35.36, 35.37, 138.72, 138.73, 377600),
+    (35.68, 35.69, 139.76, 139.77, 300),
+    (34.68, 34.69, 135.52, 135.53, 2000),
+]
+
+def parse_blob(data: Union[str, bytes]) -> np.ndarray:
+    """
+    Decode "lat,lon,elevation" lines into an (N, 3) array.
+    
+    This is the single decoder for both CSV files and XML tupleList text.
+    Well-formed input is decoded by NumPy's C parser in one pass, which also
+    drops blank lines, '#' comments and columns past the third; anything
+    else falls back to a line-by-line parse that skips malformed rows.
+    
+    Args:
+        data: Newline-separated coordinate triples
+    
+    Returns:
+        Array of shape (N, 3) with latitude, longitude and elevation columns
+    """
+    stream = io.BytesIO(data) if isinstance(data, bytes) else io.StringIO(data)
+    try:
+        with warnings.catch_warnings():
+            # Input made up only of comments or blank lines is not an error
+            warnings.simplefilter('ignore', UserWarning)
+            return np.loadtxt(stream, dtype=np.float64, delimiter=',', comments='#',
+                              usecols=(0, 1, 2), ndmin=2)
+    except ValueError:
+        pass
+    
+    if isinstance(data, bytes):
+        data = data.decode('utf-8', errors='replace')
+    
+    rows = []
+    for line in data.split('\n'):
+        parts = line.strip().split(',')
+        if len(parts) >= 3:
+            try:
+                rows.append((float(parts[0]), float(parts[1]), float(parts[2])))
+            except ValueError:
+                continue
+    
+    return np.array(rows, dtype=np.float64).reshape(-1, 3)
+
+def _advise(fd: int, advice: str) -> None:
+    """
+    Pass an access-pattern hint to the kernel where posix_fadvise exists.
+    
+    Args:
+        fd: Open file descriptor
+        advice: Name of an os.POSIX_FADV_* constant
+    """
+    if hasattr(os, 'posix_fadvise') and hasattr(os, advice):
+        os.posix_fadvise(fd, 0, 0, getattr(os, advice))
+
+@njit(cache=True)
+def _set_cell(grid: np.ndarray, lat: float, lon: float, elevation: float,
+              min_lat: float, max_lat: float, min_lon: float, max_lon: float,
+              inv_grid_size: float) -> None:
+    """
+    Write one elevation sample into the grid cell containing it.
+    
+    Compiled with numba when available; see GSIElevationConverter.set_elevation.
+    """
+    if lat < min_lat or lat > max_lat:
+        return
+    if lon < min_lon or lon > max_lon:
+        return
+    if not math.isfinite(elevation):
+        return
+    
+    x = int((lon - min_lon) * inv_grid_size)
+    y = int((lat - min_lat) * inv_grid_size)
+    
+    if 0 <= x < grid.shape[1] and 0 <= y < grid.shape[0]:
+        elevation_cm = int(elevation * 100)
+        if elevation_cm < -32768:
+            elevation_cm = -32768
+        elif elevation_cm > 32767:
+            elevation_cm = 32767
+        
+        grid[y, x] = elevation_cm
+
+class _GSIXMLHandler:
+    """
+    Expat callbacks that keep only tupleList and envelope corner text.
+    
+    Character data is buffered for one captured element at a time, so memory
+    is bounded by the largest tupleList rather than the whole document.
+    """
+    
+    CAPTURED_TAGS = (GML_TUPLE_LIST, GML_LOWER_CORNER, GML_UPPER_CORNER)
+    
+    def __init__(self):
+        self.chunks = []
+        self.corners = {}
+        self._tag = None
+        self._text = []
+    
+    def start_element(self, name: str, attrs: dict) -> None:
+        tag = '{' + name
+        if tag in self.CAPTURED_TAGS:
+            self._tag = tag
+            self._text = []
+    
+    def character_data(self, data: str) -> None:
+        if self._tag is not None:
+            self._text.append(data)
+    
+    def end_element(self, name: str) -> None:
+        tag = '{' + name
+        if tag != self._tag:
+            return
+        
+        text = ''.join(self._text).strip()
+        self._tag = None
+        self._text = []
+        
+        if tag == GML_TUPLE_LIST:
+            self.chunks.append(parse_blob(text))
+        else:
+            self.corners.setdefault(tag, text)
+
+def read_gsi_xml(xml_path: str) -> Tuple[np.ndarray, Optional[Bounds]]:
+    """
+    Read all coordinate triples from a GSI XML file.
+    
+    Args:
+        xml_path: Path to the GSI XML file
+    
+    Returns:
+        Array of shape (N, 3) with latitude, longitude and elevation columns,
+        and the file's gml:Envelope bounds if it has one
+    """
+    handler = _GSIXMLHandler()
+    
+    # Report namespaced names as "uri}local" so '{' + name matches the GML_* tags
+    parser = expat.ParserCreate(namespace_separator='}')
+    parser.buffer_text = True
+    parser.StartElementHandler = handler.start_element
+    parser.EndElementHandler = handler.end_element
+    parser.CharacterDataHandler = handler.character_data
+    
+    with open(xml_path, 'rb') as f:
+        _advise(f.fileno(), 'POSIX_FADV_SEQUENTIAL')
+        if os.fstat(f.fileno()).st_size == 0:
+            parser.Parse(b'', True)
+        else:
+            # Hand expat the page-cache mapping directly rather than copying
+            # the file through read() buffers
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                parser.Parse(data, True)
+        _advise(f.fileno(), 'POSIX_FADV_DONTNEED')
+    
+    bounds = None
+    try:
+        lower_lat, lower_lon = map(float, handler.corners[GML_LOWER_CORNER].split())
+        upper_lat, upper_lon = map(float, handler.corners[GML_UPPER_CORNER].split())
+        bounds = (lower_lat, upper_lat, lower_lon, upper_lon)
+    except (KeyError, ValueError):
+        pass
+    
+    if not handler.chunks:
+        return np.empty((0, 3), dtype=np.float64), bounds
+    return np.concatenate(handler.chunks), bounds
+
+def read_csv_data(csv_path: str) -> Tuple[np.ndarray, Optional[Bounds]]:
+    """
+    Read all coordinate triples from a CSV file.
+    
+    Args:
+        csv_path: Path to the CSV file
+    
+    Returns:
+        Array of shape (N, 3) with latitude, longitude and elevation columns,
+        and None since CSV files carry no bounds
+    """
+    with open(csv_path, 'rb') as f:
+        _advise(f.fileno(), 'POSIX_FADV_SEQUENTIAL')
+        data = f.read()
+        _advise(f.fileno(), 'POSIX_FADV_DONTNEED')
+    return parse_blob(data), None
+
+def read_points(path: str,
+                reader: Optional[Callable[[str], Tuple[np.ndarray, Optional[Bounds]]]] = None
+                ) -> Tuple[np.ndarray, Optional[Bounds]]:
+    """
+    Read coordinate triples from an input file, logging instead of raising.
+    
+    This is a module-level function so it can be handed to multiprocessing.
+    
+    Args:
+        path: Path to an XML or CSV file
+        reader: Reader to use (default: chosen from the file extension)
+    
+    Returns:
+        Array of shape (N, 3), empty if the file could not be read, and the
+        file's bounds if known
+    """
+    if reader is None:
+        reader = read_csv_data if Path(path).suffix.lower() == '.csv' else read_gsi_xml
+    
+    try:
+        points, bounds = reader(path)
+    except Exception as e:
+        logger.error(f"Error processing {path}: {e}")
+        return np.empty((0, 3), dtype=np.float64), None
+    
+    kind = 'CSV' if reader is read_csv_data else 'XML'
+    logger.info(f"Processed {kind} file: {path}")
+    return points, bounds
+
 class GSIElevationConverter:
     def __init__(self, 
                  min_lat: float = 20.0,
                  max_lat: float = 46.0,
                  min_lon: float = 122.0,
                  max_lon: float = 154.0,
-                 grid_size: float = 0.001):
+                 grid_size: float = 0.001,
+                 grid_path: Optional[str] = None,
+                 bilinear: bool = False):
         """
         Initialize the converter with grid parameters.
         
@@ -33,17 +287,37 @@ class GSIElevationConverter:
             min_lon: Minimum longitude (default: 122.0)
             max_lon: Maximum longitude (default: 154.0)
             grid_size: Grid resolution in degrees (default: 0.001, ~100m)
+            grid_path: File to back the grid with a memory map; the grid is
+                kept in RAM when omitted (default: None)
+            bilinear: Accumulate samples into the four surrounding cells with
+                bilinear weights; call finalize() once all input is read
+                (default: False)
         """
         self.min_lat = min_lat
         self.max_lat = max_lat
         self.min_lon = min_lon
         self.max_lon = max_lon
         self.grid_size = grid_size
+        # Multiply instead of divide per point, as ElevationGrid does on lookup
+        self.inv_grid_size = 1.0 / grid_size
         
         self.width = int((max_lon - min_lon) / grid_size)
         self.height = int((max_lat - min_lat) / grid_size)
         
-        self.grid = np.full((self.height, self.width), -9999, dtype=np.int16)
+        self.grid_path = grid_path
+        if grid_path:
+            self.grid = np.memmap(grid_path, dtype='<i2', mode='w+',
+                                  shape=(self.height, self.width))
+            self.grid[:] = -9999
+        else:
+            self.grid = np.full((self.height, self.width), -9999, dtype=np.int16)
+        
+        self._scratch = np.empty(0, dtype=np.float64)
+        
+        self.bilinear = bilinear
+        if bilinear:
+            self._weighted_sum = np.zeros((self.height, self.width), dtype=np.float32)
+            self._weight_sum = np.zeros((self.height, self.width), dtype=np.float32)
         
         logger.info(f"Grid dimensions: {self.width} x {self.height}")
         logger.info(f"Grid size: {grid_size} degrees (~{grid_size * 111000:.0f}m)")
@@ -56,30 +330,8 @@ class GSIElevationConverter:
         Args:
             xml_path: Path to the GSI XML file
         """
-        try:
-            tree = ET.parse(xml_path)
-            root = tree.getroot()
-            
-            ns = {'gml': 'http://www.opengis.net/gml/3.2'}
-            
-            for tuple_list in root.findall('.//gml:tupleList', ns):
-                text = tuple_list.text.strip()
-                for line in text.split('\n'):
-                    parts = line.strip().split(',')
-                    if len(parts) >= 3:
-                        try:
-                            lat = float(parts[0])
-                            lon = float(parts[1])
-                            elev = float(parts[2])
-                            
-                            self.set_elevation(lat, lon, elev)
-                        except ValueError:
-                            continue
-            
-            logger.info(f"Processed XML file: {xml_path}")
-            
-        except Exception as e:
-            logger.error(f"Error processing {xml_path}: {e}")
+        points, bounds = read_points(xml_path, read_gsi_xml)
+        self._set_elevation_bulk(points[:, 0], points[:, 1], points[:, 2], bounds)
     
     def parse_csv_data(self, csv_path: str) -> None:
         """
@@ -88,28 +340,29 @@ class GSIElevationConverter:
         Args:
             csv_path: Path to the CSV file
         """
-        try:
-            with open(csv_path, 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    if not line or line.startswith('#'):
-                        continue
-                    
-                    parts = line.split(',')
-                    if len(parts) >= 3:
-                        try:
-                            lat = float(parts[0])
-                            lon = float(parts[1])
-                            elev = float(parts[2])
-                            
-                            self.set_elevation(lat, lon, elev)
-                        except ValueError:
-                            continue
-            
-            logger.info(f"Processed CSV file: {csv_path}")
-            
-        except Exception as e:
-            logger.error(f"Error processing {csv_path}: {e}")
+        points, bounds = read_points(csv_path, read_csv_data)
+        self._set_elevation_bulk(points[:, 0], points[:, 1], points[:, 2], bounds)
+    
+    def parse_files(self, paths: List[str], workers: int = 1) -> None:
+        """
+        Parse XML and CSV files, optionally decoding them in worker processes.
+        
+        Workers only decode; points are written into the grid by this process
+        in input order, so overlapping files resolve the same way as a
+        sequential run.
+        
+        Args:
+            paths: Input file paths
+            workers: Number of worker processes (default: 1, no pool)
+        """
+        if workers > 1 and len(paths) > 1:
+            with multiprocessing.Pool(min(workers, len(paths))) as pool:
+                for points, bounds in pool.imap(read_points, paths):
+                    self._set_elevation_bulk(points[:, 0], points[:, 1], points[:, 2], bounds)
+        else:
+            for path in paths:
+                points, bounds = read_points(path)
+                self._set_elevation_bulk(points[:, 0], points[:, 1], points[:, 2], bounds)
     
     def set_elevation(self, lat: float, lon: float, elevation: float) -> None:
         """
@@ -120,20 +373,151 @@ class GSIElevationConverter:
             lon: Longitude
             elevation: Elevation in meters
         """
-        if lat < self.min_lat or lat > self.max_lat:
+        if self.bilinear:
+            self._set_elevation_bulk(np.array([lat]), np.array([lon]), np.array([elevation]))
+            return
+        
+        _set_cell(self.grid, lat, lon, elevation,
+                  self.min_lat, self.max_lat, self.min_lon, self.max_lon, self.inv_grid_size)
+    
+    def _set_elevation_bulk(self, lat: np.ndarray, lon: np.ndarray, elevation: np.ndarray,
+                            bounds: Optional[Bounds] = None) -> None:
+        """
+        Set elevations for arrays of coordinates in one vectorized pass.
+        
+        Args:
+            lat: Latitudes
+            lon: Longitudes
+            elevation: Elevations in meters
+            bounds: Bounds the points are known to lie in; per-point range
+                checks are skipped when these fall inside the grid
+        """
+        lat = np.asarray(lat, dtype=np.float64)
+        lon = np.asarray(lon, dtype=np.float64)
+        elevation = np.asarray(elevation, dtype=np.float64)
+        
+        # The envelope only says where to expect points; confirm them with four
+        # reductions, which are far cheaper than building the range mask. NaN
+        # coordinates fail these comparisons too.
+        trusted = (self._contains(bounds) and len(elevation) > 0 and
+                   bool(np.isfinite(elevation).all()) and
+                   lat.min() >= self.min_lat and lat.max() <= self.max_lat and
+                   lon.min() >= self.min_lon and lon.max() <= self.max_lon)
+        if not trusted:
+            mask = ((lat >= self.min_lat) & (lat <= self.max_lat) &
+                    (lon >= self.min_lon) & (lon <= self.max_lon) &
+                    np.isfinite(elevation))
+            lat, lon, elevation = lat[mask], lon[mask], elevation[mask]
+        
+        if self.bilinear:
+            self._splat(lat, lon, elevation)
             return
-        if lon < self.min_lon or lon > self.max_lon:
+        
+        if len(elevation) == 0:
             return
         
-        x = int((lon - self.min_lon) / self.grid_size)
-        y = int((lat - self.min_lat) / self.grid_size)
+        # Compute indices and quantized elevations through one reused float
+        # buffer instead of allocating a temporary per arithmetic step
+        scratch = self._scratch_buffer(len(elevation))
         
-        if 0 <= x < self.width and 0 <= y < self.height:
-            elevation_cm = int(elevation * 100)
-            
-            elevation_cm = max(-32768, min(32767, elevation_cm))
-            
+        np.subtract(lon, self.min_lon, out=scratch)
+        np.multiply(scratch, self.inv_grid_size, out=scratch)
+        x = scratch.astype(np.int32)
+        
+        np.subtract(lat, self.min_lat, out=scratch)
+        np.multiply(scratch, self.inv_grid_size, out=scratch)
+        y = scratch.astype(np.int32)
+        
+        np.multiply(elevation, 100, out=scratch)
+        np.clip(scratch, -32768, 32767, out=scratch)
+        elevation_cm = scratch.astype(np.int16)
+        
+        # Coordinates are within range here, so only the far edge can overflow
+        if trusted and x.max() < self.width and y.max() < self.height:
             self.grid[y, x] = elevation_cm
+            return
+        
+        inside = (x < self.width) & (y < self.height)
+        self.grid[y[inside], x[inside]] = elevation_cm[inside]
+    
+    def _scratch_buffer(self, size: int) -> np.ndarray:
+        """
+        Return a reusable float64 work buffer of at least the given length.
+        
+        Args:
+            size: Number of elements needed
+        
+        Returns:
+            View of the first size elements of the buffer
+        """
+        if self._scratch.size < size:
+            self._scratch = np.empty(size, dtype=np.float64)
+        return self._scratch[:size]
+    
+    def _contains(self, bounds: Optional[Bounds]) -> bool:
+        """
+        Check whether every point within the given bounds maps to a grid cell.
+        
+        Args:
+            bounds: (min_lat, max_lat, min_lon, max_lon), or None
+        
+        Returns:
+            True if the bounds are known and lie inside the grid
+        """
+        if bounds is None:
+            return False
+        
+        min_lat, max_lat, min_lon, max_lon = bounds
+        return (self.min_lat <= min_lat <= max_lat <= self.max_lat and
+                self.min_lon <= min_lon <= max_lon <= self.max_lon and
+                int((max_lon - self.min_lon) * self.inv_grid_size) < self.width and
+                int((max_lat - self.min_lat) * self.inv_grid_size) < self.height)
+    
+    def _splat(self, lat: np.ndarray, lon: np.ndarray, elevation: np.ndarray) -> None:
+        """
+        Accumulate samples into the four cells whose centres surround them.
+        
+        Args:
+            lat: Latitudes inside the grid bounds
+            lon: Longitudes inside the grid bounds
+            elevation: Finite elevations in meters
+        """
+        # Cell (y, x) covers [x, x + 1) in grid units, so its centre is at x + 0.5
+        fx = (lon - self.min_lon) * self.inv_grid_size - 0.5
+        fy = (lat - self.min_lat) * self.inv_grid_size - 0.5
+        x0 = np.floor(fx).astype(np.intp)
+        y0 = np.floor(fy).astype(np.intp)
+        px = fx - x0
+        py = fy - y0
+        
+        for dy, dx, weight in ((0, 0, (1 - px) * (1 - py)),
+                               (0, 1, px * (1 - py)),
+                               (1, 0, (1 - px) * py),
+                               (1, 1, px * py)):
+            x = x0 + dx
+            y = y0 + dy
+            inside = (x >= 0) & (x < self.width) & (y >= 0) & (y < self.height) & (weight > SPLAT_MIN_WEIGHT)
+            cells = (y[inside], x[inside])
+            np.add.at(self._weighted_sum, cells, weight[inside] * elevation[inside])
+            np.add.at(self._weight_sum, cells, weight[inside])
+    
+    def finalize(self) -> None:
+        """
+        Resolve accumulated bilinear samples into the grid.
+        
+        Cells that received no weight keep their current value. Does nothing
+        unless the converter was created with bilinear=True.
+        """
+        if not self.bilinear:
+            return
+        
+        covered = self._weight_sum > SPLAT_MIN_WEIGHT
+        elevation = self._weighted_sum[covered] / self._weight_sum[covered]
+        self.grid[covered] = np.clip(elevation.astype(np.float64) * 100, -32768, 32767).astype(np.int16)
+        
+        self.bilinear = False
+        self._weighted_sum = None
+        self._weight_sum = None
     
     def interpolate_missing(self) -> None:
         """
@@ -145,9 +529,23 @@ class GSIElevationConverter:
         
         mask = self.grid != -9999
         
+        if mask.all():
+            logger.info("No missing data points to interpolate")
+            return
+        if not mask.any():
+            logger.warning("No valid data points; skipping interpolation")
+            return
+        
         indices = ndimage.distance_transform_edt(~mask, return_distances=False, return_indices=True)
         
-        self.grid = self.grid[tuple(indices)]
+        # Gather row block by row block straight into the grid. This is safe
+        # in place because valid cells map to themselves and are never
+        # overwritten, and it avoids materialising a second full grid.
+        flat_grid = self.grid.reshape(-1)
+        for y0 in range(0, self.height, INTERPOLATE_BLOCK_ROWS):
+            y1 = min(y0 + INTERPOLATE_BLOCK_ROWS, self.height)
+            source = indices[0, y0:y1].astype(np.intp) * self.width + indices[1, y0:y1]
+            self.grid[y0:y1] = flat_grid[source]
         
         logger.info("Interpolation complete")
     
@@ -158,12 +556,37 @@ class GSIElevationConverter:
         Args:
             output_path: Path for the output binary file
         """
-        with open(output_path, 'wb') as f:
-            self.grid.astype('<i2').tofile(f)
+        if self.grid_path:
+            # The grid already lives on disk in the output format
+            self.grid.flush()
+            os.replace(self.grid_path, output_path)
+            self.grid_path = output_path
+        else:
+            with open(output_path, 'wb') as f:
+                self.grid.astype('<i2').tofile(f)
         
         logger.info(f"Saved binary data to {output_path}")
         logger.info(f"File size: {Path(output_path).stat().st_size / (1024**2):.2f} MB")
     
+    def save_compressed(self, compressed_path: str) -> None:
+        """
+        Save the grid as a zstd-compressed copy of the binary file.
+        
+        Args:
+            compressed_path: Path for the compressed output file
+        """
+        import zstandard as zstd
+        
+        compressor = zstd.ZstdCompressor(level=3, threads=-1)
+        with open(compressed_path, 'wb') as f:
+            with compressor.stream_writer(f, size=self.grid.nbytes) as writer:
+                for y0 in range(0, self.height, COMPRESS_BLOCK_ROWS):
+                    block = self.grid[y0:y0 + COMPRESS_BLOCK_ROWS]
+                    writer.write(np.ascontiguousarray(block, dtype='<i2'))
+        
+        logger.info(f"Saved compressed data to {compressed_path}")
+        logger.info(f"File size: {Path(compressed_path).stat().st_size / (1024**2):.2f} MB")
+    
     def save_header(self, header_path: str) -> None:
         """
         Save the grid header information.
@@ -172,13 +595,9 @@ class GSIElevationConverter:
             header_path: Path for the header file
         """
         with open(header_path, 'wb') as f:
-            f.write(struct.pack('<i', self.width))
-            f.write(struct.pack('<i', self.height))
-            f.write(struct.pack('<d', self.min_lat))
-            f.write(struct.pack('<d', self.max_lat))
-            f.write(struct.pack('<d', self.min_lon))
-            f.write(struct.pack('<d', self.max_lon))
-            f.write(struct.pack('<d', self.grid_size))
+            f.write(struct.pack(HEADER_FORMAT, self.width, self.height,
+                                self.min_lat, self.max_lat, self.min_lon, self.max_lon,
+                                self.grid_size))
         
         logger.info(f"Saved header to {header_path}")
     
@@ -188,20 +607,27 @@ class GSIElevationConverter:
         """
         logger.info("Generating test elevation data...")
         
-        for y in range(self.height):
-            for x in range(self.width):
-                lat = self.min_lat + y * self.grid_size
-                lon = self.min_lon + x * self.grid_size
-                
-                if 35.36 <= lat <= 35.37 and 138.72 <= lon <= 138.73:
-                    self.grid[y, x] = 377600
-                elif 35.68 <= lat <= 35.69 and 139.76 <= lon <= 139.77:
-                    self.grid[y, x] = 300
-                elif 34.68 <= lat <= 34.69 and 135.52 <= lon <= 135.53:
-                    self.grid[y, x] = 2000
-                else:
-                    base_elevation = 500 + x * 0.01 + y * 0.02
-                    self.grid[y, x] = int(base_elevation)
+        y = np.arange(self.height)
+        x = np.arange(self.width)
+        lat = self.min_lat + y * self.grid_size
+        lon = self.min_lon + x * self.grid_size
+        
+        lon_term = 500 + x * 0.01
+        lat_term = y * 0.02
+        
+        # Fill tile by tile so the float temporaries stay cache-sized
+        # instead of being a float64 copy of the whole grid
+        for y0 in range(0, self.height, TEST_DATA_TILE):
+            lat_block = lat_term[y0:y0 + TEST_DATA_TILE, np.newaxis]
+            for x0 in range(0, self.width, TEST_DATA_TILE):
+                lon_block = lon_term[np.newaxis, x0:x0 + TEST_DATA_TILE]
+                self.grid[y0:y0 + TEST_DATA_TILE, x0:x0 + TEST_DATA_TILE] = lon_block + lat_block
+        
+        # Earlier entries take precedence where regions overlap
+        for lat_min, lat_max, lon_min, lon_max, elevation_cm in reversed(TEST_REGIONS):
+            rows = (lat >= lat_min) & (lat <= lat_max)
+            cols = (lon >= lon_min) & (lon <= lon_max)
+            self.grid[np.ix_(rows, cols)] = max(-32768, min(32767, elevation_cm))
         
         logger.info("Test data generation complete")
     
@@ -213,23 +639,24 @@ class GSIElevationConverter:
             Dictionary with statistics
         """
         valid_data = self.grid[self.grid != -9999]
+        total_points = self.width * self.height
         
         if len(valid_data) == 0:
             return {
-                'total_points': self.width * self.height,
+                'total_points': total_points,
                 'valid_points': 0,
-                'missing_points': self.width * self.height,
+                'missing_points': total_points,
                 'coverage': 0.0
             }
         
         return {
-            'total_points': self.width * self.height,
+            'total_points': total_points,
             'valid_points': len(valid_data),
-            'missing_points': np.sum(self.grid == -9999),
+            'missing_points': total_points - len(valid_data),
             'min_elevation': float(np.min(valid_data) / 100),
             'max_elevation': float(np.max(valid_data) / 100),
             'mean_elevation': float(np.mean(valid_data) / 100),
-            'coverage': len(valid_data) / (self.width * self.height) * 100
+            'coverage': len(valid_data) / total_points * 100
         }
 
 def main():
@@ -243,6 +670,12 @@ def main():
                         help='Generate test data instead of processing input files')
     parser.add_argument('--interpolate', action='store_true',
                         help='Interpolate missing data points')
+    parser.add_argument('--bilinear', action='store_true',
+                        help='Spread each sample over the four nearest cells with bilinear weights')
+    parser.add_argument('--compress', action='store_true',
+                        help='Also write a zstd-compressed copy of the output (<output>.zst)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Number of processes used to parse input files (default: 1)')
     parser.add_argument('--min-lat', type=float, default=20.0,
                         help='Minimum latitude (default: 20.0)')
     parser.add_argument('--max-lat', type=float, default=46.0,
@@ -256,60 +689,71 @@ def main():
     
     args = parser.parse_args()
     
+    if not args.test:
+        if not args.input:
+            logger.error("Please specify --input or --test option")
+            return
+        
+        input_path = Path(args.input)
+        if not input_path.is_dir() and input_path.suffix.lower() not in ('.xml', '.csv'):
+            logger.error(f"Unsupported file type: {input_path.suffix}")
+            return
+    
     Path(args.output).parent.mkdir(parents=True, exist_ok=True)
     Path(args.header).parent.mkdir(parents=True, exist_ok=True)
     
-    converter = GSIElevationConverter(
-        min_lat=args.min_lat,
-        max_lat=args.max_lat,
-        min_lon=args.min_lon,
-        max_lon=args.max_lon,
-        grid_size=args.grid_size
-    )
-    
-    if args.test:
-        converter.generate_test_data()
-    elif args.input:
-        input_path = Path(args.input)
+    # Everything is built in a scratch file next to the output, which
+    # save_binary renames into place; never leave it behind on failure
+    grid_path = args.output + '.tmp'
+    converter = None
+    try:
+        converter = GSIElevationConverter(
+            min_lat=args.min_lat,
+            max_lat=args.max_lat,
+            min_lon=args.min_lon,
+            max_lon=args.max_lon,
+            grid_size=args.grid_size,
+            grid_path=grid_path,
+            bilinear=args.bilinear
+        )
         
-        if input_path.is_dir():
-            xml_files = list(input_path.glob('**/*.xml'))
-            csv_files = list(input_path.glob('**/*.csv'))
+        if args.test:
+            converter.generate_test_data()
+        else:
+            if input_path.is_dir():
+                xml_files = list(input_path.glob('**/*.xml'))
+                csv_files = list(input_path.glob('**/*.csv'))
+                
+                logger.info(f"Found {len(xml_files)} XML files and {len(csv_files)} CSV files")
+                
+                converter.parse_files([str(f) for f in xml_files + csv_files], workers=args.workers)
             
-            logger.info(f"Found {len(xml_files)} XML files and {len(csv_files)} CSV files")
+            elif input_path.suffix.lower() == '.xml':
+                converter.parse_gsi_xml(str(input_path))
             
-            for xml_file in xml_files:
-                converter.parse_gsi_xml(str(xml_file))
+            else:
+                converter.parse_csv_data(str(input_path))
             
-            for csv_file in csv_files:
-                converter.parse_csv_data(str(csv_file))
-        
-        elif input_path.suffix.lower() == '.xml':
-            converter.parse_gsi_xml(str(input_path))
-        
-        elif input_path.suffix.lower() == '.csv':
-            converter.parse_csv_data(str(input_path))
+            converter.finalize()
+            
+            if args.interpolate:
+                converter.interpolate_missing()
         
-        else:
-            logger.error(f"Unsupported file type: {input_path.suffix}")
-            return
+        converter.save_binary(args.output)
+        if args.compress:
+            converter.save_compressed(args.output + '.zst')
+        converter.save_header(args.header)
         
-        if args.interpolate:
-            converter.interpolate_missing()
-    else:
-        logger.error("Please specify --input or --test option")
-        return
-    
-    converter.save_binary(args.output)
-    converter.save_header(args.header)
-    
-    stats = converter.get_statistics()
-    logger.info("Data statistics:")
-    for key, value in stats.items():
-        if isinstance(value, float):
-            logger.info(f"  {key}: {value:.2f}")
-        else:
-            logger.info(f"  {key}: {value}")
+        stats = converter.get_statistics()
+        logger.info("Data statistics:")
+        for key, value in stats.items():
+            if isinstance(value, float):
+                logger.info(f"  {key}: {value:.2f}")
+            else:
+                logger.info(f"  {key}: {value}")
+    finally:
+        if (converter is None or converter.grid_path == grid_path) and os.path.exists(grid_path):
+            os.remove(grid_path)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file